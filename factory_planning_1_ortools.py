@@ -7,10 +7,10 @@
    Optimization model written below uses Google OR-Tools
 """
 
-import itertools
-
 from ortools.linear_solver import pywraplp
 
+from solver_utils import print_solution, verbose_flag
+
 # =============================================================================
 # Data
 # =============================================================================
@@ -112,12 +112,13 @@ hours_per_month = 2 * 8 * 24
 
 # model instantiation
 model = pywraplp.Solver("factory_planning_1", pywraplp.Solver.GLOP_LINEAR_PROGRAMMING)
+model.SuppressOutput()
 
 # =============================================================================
 # # Decision variables:
 # =============================================================================
 
-month_product = list(itertools.product(months, products))
+month_product = [(mth, prd) for mth in months for prd in products]
 
 # 1.Number of units of every product to manufacture in each month
 dv_manufacture = {i: model.NumVar(0, 1000000, "manuf_" + str(i)) for i in month_product}
@@ -188,21 +189,12 @@ obj_func = model.Sum(
 # solving the model
 model.Maximize(obj_func)
 
-status = model.Solve()
 
-# test if solution is optimal
-if status == pywraplp.Solver.OPTIMAL:
-    print("Solution:")
-    print("Objective value =", model.Objective().Value())
-else:
-    print("The problem does not have an optimal solution.")
+def main(verbose=False):
+    """Solve the factory planning 1 model and print its objective value."""
+    status = model.Solve()
+    print_solution(model, status, verbose)
 
-print("\n")
-print("Problem size:")
-print("Number of decision variables =", model.NumVariables())
-print("Number of constraints =", model.NumConstraints())
 
-print("\n")
-print("Advanced usage:")
-print("Problem solved in %s seconds" % str(model.wall_time() / 1000))
-print("Problem solved in %s iterations" % str(model.iterations()))
+if __name__ == "__main__":
+    main(verbose_flag())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""This model is implementation of factory planning 2 problem [example #4]
+   listed in fifth edition of Modeling Building in Mathematical Programming
+   by H. P. Williams on pages 256 and 302 – 303
+   Optimization model written below uses the CP-SAT solver of Google OR-Tools
+"""
+
+from ortools.sat.python import cp_model
+
+from factory_planning_2_ortools import (
+    hours_per_month,
+    inventory_holding_cost,
+    inventory_target,
+    machines,
+    machines_down,
+    machines_installed,
+    manufacture_ub_table,
+    max_sales_table,
+    maximum_inventory,
+    months,
+    products,
+    profit,
+    time_required,
+)
+from solver_utils import verbose_flag
+
+# =============================================================================
+# Data
+# =============================================================================
+
+# The data is that of factory_planning_2_ortools, scaled to integers below.
+
+# CP-SAT only accepts integer coefficients: quantities are modelled in
+# hundredths of a unit so the 0.01 time coefficients stay exact, and the
+# objective is doubled to absorb the 0.5 holding cost.
+scale = 100
+obj_scale = 2
+
+# scaled time coefficients indexed by [machine index][product index],
+# products a machine does not work on are left out
+prd_index = {prd: pi for pi, prd in enumerate(products)}
+time_required_scaled = [
+    {prd_index[prd]: int(round(tr * scale)) for prd, tr in time_required[mach].items()}
+    for mach in machines
+]
+
+# model instantiation
+model = cp_model.CpModel()
+
+# =============================================================================
+# # Decision variables:
+# =============================================================================
+
+# Variables are kept in nested lists indexed by integer positions,
+# [month index][product index] and [month index][machine index].
+
+# 1.Number of units (in hundredths) of every product to manufacture in each month
+manufacture_ub = manufacture_ub_table(maximum_inventory)
+dv_manufacture = [
+    [
+        model.NewIntVar(0, manufacture_ub[mi][pi] * scale, "manuf_" + mth + "_" + prd)
+        for pi, prd in enumerate(products)
+    ]
+    for mi, mth in enumerate(months)
+]
+
+# 2. Number of units (in hundredths) of every product to store in each month
+dv_inventory = [
+    [
+        model.NewIntVar(0, maximum_inventory * scale, "invt_" + mth + "_" + prd)
+        for prd in products
+    ]
+    for mth in months
+]
+
+# 3. Number of units (in hundredths) of every product to sell in each month
+dv_sold = [
+    [
+        model.NewIntVar(0, max_sales_table[mi][pi] * scale, "sold_" + mth + "_" + prd)
+        for pi, prd in enumerate(products)
+    ]
+    for mi, mth in enumerate(months)
+]
+
+# 4. Number of machines of scheduled for maintenance in each month
+dv_repair = [
+    [
+        model.NewIntVar(0, machines_down[mach], "down_" + mth + "_" + mach)
+        for mach in machines
+    ]
+    for mth in months
+]
+
+
+# =============================================================================
+# # Constraints:
+# =============================================================================
+
+# 1. Initial Balance: For each product the number of units produced
+#    should be equal to the number of units sold plus inventory
+for pi in range(len(products)):
+    model.Add(dv_manufacture[0][pi] == dv_sold[0][pi] + dv_inventory[0][pi])
+
+# 2. Balance: For each product the number of units produced in each month
+#    and the ones previously stored should be equal to the number of units
+#    sold and inventory stored in that month
+for mi in range(1, len(months)):
+    for pi in range(len(products)):
+        model.Add(
+            dv_inventory[mi - 1][pi] + dv_manufacture[mi][pi]
+            == dv_sold[mi][pi] + dv_inventory[mi][pi]
+        )
+
+
+# 3. Inventory Target: The number of units of product kept in inventory
+#    at the end of the planning horizon should be equal to inventory target
+for pi in range(len(products)):
+    model.Add(dv_inventory[-1][pi] == inventory_target * scale)
+
+# 4. Machine Capacity: Total time used to manufacture any product at machine
+#    cannot exceed its monthly capacity (in hours).
+for mi in range(len(months)):
+    for ki, mach in enumerate(machines):
+        model.Add(
+            sum(
+                coeff * dv_manufacture[mi][pi]
+                for pi, coeff in time_required_scaled[ki].items()
+            )
+            <= hours_per_month
+            * scale
+            * scale
+            * (machines_installed[mach] - dv_repair[mi][ki])
+        )
+
+# 5. The number of machines scheduled for maintenance should meet the
+#    downtime requirement.
+for ki, mach in enumerate(machines):
+    model.Add(
+        sum(dv_repair_mth[ki] for dv_repair_mth in dv_repair) == machines_down[mach]
+    )
+
+# =============================================================================
+# # Objective function
+# =============================================================================
+
+obj_func = sum(
+    obj_scale * profit[prd] * dv_sold[mi][pi]
+    for mi in range(len(months))
+    for pi, prd in enumerate(products)
+) - sum(
+    int(obj_scale * inventory_holding_cost) * var
+    for dv_inventory_mth in dv_inventory
+    for var in dv_inventory_mth
+)
+
+model.Maximize(obj_func)
+
+
+def main(verbose=False):
+    """Solve the CP-SAT model of factory planning 2 and print its objective
+    value rescaled to the original units."""
+    # solving the model
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = 8
+
+    status = solver.Solve(model)
+
+    # test if solution is optimal
+    if status == cp_model.OPTIMAL:
+        print("Solution:")
+        print("Objective value =", solver.ObjectiveValue() / (obj_scale * scale))
+    else:
+        print("The problem does not have an optimal solution.")
+
+    if verbose:
+        print("\n")
+        print("Problem size:")
+        print("Number of decision variables =", len(model.Proto().variables))
+        print("Number of constraints =", len(model.Proto().constraints))
+
+        print("\n")
+        print("Advanced usage:")
+        print("Problem solved in %s seconds" % str(solver.WallTime()))
+        print("Problem solved in %d branches" % solver.NumBranches())
+
+
+if __name__ == "__main__":
+    main(verbose_flag())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""This model is implementation of factory planning 2 problem [example #4]
+   listed in fifth edition of Modeling Building in Mathematical Programming
+   by H. P. Williams on pages 256 and 302 – 303
+   Optimization model written below builds an OR-Tools MPModelProto directly
+   and hands it to the solver in a single call
+"""
+
+from ortools.linear_solver import linear_solver_pb2
+
+from factory_planning_2_ortools import (
+    create_solver,
+    hours_per_month,
+    inventory_holding_cost,
+    inventory_target,
+    machines,
+    machines_down,
+    machines_installed,
+    manufacture_ub_table,
+    max_sales_table,
+    maximum_inventory,
+    months,
+    products,
+    profit,
+    solver_parameters,
+    time_required,
+)
+from solver_utils import print_solution, verbose_flag
+
+# =============================================================================
+# Data
+# =============================================================================
+
+# The data, bounds and solver settings are those of factory_planning_2_ortools,
+# only the way the model is handed to the solver differs.
+
+# model instantiation
+# The model is written straight into the proto, so no per-term calls go
+# through the pywraplp wrapper while it is built.
+model_proto = linear_solver_pb2.MPModelProto(name="factory_planning_2", maximize=True)
+
+
+def add_variable(lb, ub, name, objective_coefficient=0, is_integer=False):
+    """Append a variable to the model proto and return its index."""
+    var = model_proto.variable.add()
+    var.lower_bound = lb
+    var.upper_bound = ub
+    var.name = name
+    var.objective_coefficient = objective_coefficient
+    var.is_integer = is_integer
+    return len(model_proto.variable) - 1
+
+
+def add_constraint(var_index, coefficient, lb, ub):
+    """Append a linear constraint lb <= sum(coefficient * var) <= ub."""
+    ct = model_proto.constraint.add()
+    ct.var_index.extend(var_index)
+    ct.coefficient.extend(coefficient)
+    ct.lower_bound = lb
+    ct.upper_bound = ub
+
+
+# =============================================================================
+# # Decision variables:
+# =============================================================================
+
+# Variables are referred to by their index in the proto, kept in nested lists
+# indexed by [month index][product index] and [month index][machine index].
+
+# 1.Number of units of every product to manufacture in each month
+manufacture_ub = manufacture_ub_table(maximum_inventory)
+dv_manufacture = [
+    [
+        add_variable(0, manufacture_ub[mi][pi], "manuf_" + mth + "_" + prd)
+        for pi, prd in enumerate(products)
+    ]
+    for mi, mth in enumerate(months)
+]
+
+# 2. Number of units of every product to store in each month
+#    (holding cost is charged in the objective)
+dv_inventory = [
+    [
+        add_variable(
+            0, maximum_inventory, "invt_" + mth + "_" + prd, -inventory_holding_cost
+        )
+        for prd in products
+    ]
+    for mth in months
+]
+
+# 3. Number of units of every product to sell in each month
+#    (profit is earned in the objective)
+dv_sold = [
+    [
+        add_variable(0, max_sales_table[mi][pi], "sold_" + mth + "_" + prd, profit[prd])
+        for pi, prd in enumerate(products)
+    ]
+    for mi, mth in enumerate(months)
+]
+
+# 4. Number of machines of scheduled for maintenance in each month
+dv_repair = [
+    [
+        add_variable(
+            0, machines_down[mach], "down_" + mth + "_" + mach, is_integer=True
+        )
+        for mach in machines
+    ]
+    for mth in months
+]
+
+
+# =============================================================================
+# # Constraints:
+# =============================================================================
+
+# 1. Initial Balance: For each product the number of units produced
+#    should be equal to the number of units sold plus inventory
+for pi in range(len(products)):
+    add_constraint(
+        [dv_manufacture[0][pi], dv_sold[0][pi], dv_inventory[0][pi]], [1, -1, -1], 0, 0
+    )
+
+# 2. Balance: For each product the number of units produced in each month
+#    and the ones previously stored should be equal to the number of units
+#    sold and inventory stored in that month
+for mi in range(1, len(months)):
+    for pi in range(len(products)):
+        add_constraint(
+            [
+                dv_inventory[mi - 1][pi],
+                dv_manufacture[mi][pi],
+                dv_sold[mi][pi],
+                dv_inventory[mi][pi],
+            ],
+            [1, 1, -1, -1],
+            0,
+            0,
+        )
+
+
+# 3. Inventory Target: The number of units of product kept in inventory
+#    at the end of the planning horizon should be equal to inventory target
+for pi in range(len(products)):
+    add_constraint([dv_inventory[-1][pi]], [1], inventory_target, inventory_target)
+
+# 4. Machine Capacity: Total time used to manufacture any product at machine
+#    cannot exceed its monthly capacity (in hours). The repaired machines are
+#    moved to the left-hand side:
+#    sum(time * manufacture) + hours * repair <= hours * installed
+prd_index = {prd: pi for pi, prd in enumerate(products)}
+mach_cache = [
+    (
+        [prd_index[prd] for prd in time_required[mach]],
+        [time_required[mach][prd] for prd in time_required[mach]],
+    )
+    for mach in machines
+]
+for mi in range(len(months)):
+    for ki, mach in enumerate(machines):
+        mach_prds, mach_coeffs = mach_cache[ki]
+        add_constraint(
+            [dv_manufacture[mi][pi] for pi in mach_prds] + [dv_repair[mi][ki]],
+            mach_coeffs + [hours_per_month],
+            -float("inf"),
+            hours_per_month * machines_installed[mach],
+        )
+
+# 5. The number of machines scheduled for maintenance should meet the
+#    downtime requirement.
+for ki, mach in enumerate(machines):
+    add_constraint(
+        [dv_repair_mth[ki] for dv_repair_mth in dv_repair],
+        [1] * len(months),
+        machines_down[mach],
+        machines_down[mach],
+    )
+
+
+# solving the model
+model = create_solver()
+# a proto the solver rejects would otherwise be solved as an empty model
+load_error = model.LoadModelFromProto(model_proto)
+if load_error:
+    raise ValueError("invalid factory planning 2 model proto: " + load_error)
+
+
+def main(verbose=False):
+    """Solve the factory planning 2 proto model and print its objective value."""
+    status = model.Solve(solver_parameters())
+    print_solution(model, status, verbose)
+
+
+if __name__ == "__main__":
+    main(verbose_flag())
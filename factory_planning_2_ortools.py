@@ -7,10 +7,11 @@
    Optimization model written below uses Google OR-Tools
 """
 
-import itertools
-
 from ortools.linear_solver import pywraplp
 
+from model_cache import cached_model
+from solver_utils import print_solution, verbose_flag
+
 # =============================================================================
 # Data
 # =============================================================================
@@ -101,116 +102,197 @@ maximum_inventory = 100
 inventory_target = 50
 hours_per_month = 2 * 8 * 24
 
-# model instantiation
-model = pywraplp.Solver(
-    "factory_planning_2", pywraplp.Solver.CBC_MIXED_INTEGER_PROGRAMMING
-)
+# lookup table indexed by [month index][product index]
+max_sales_table = [[max_sales[mth, prd] for prd in products] for mth in months]
 
-# =============================================================================
-# # Decision variables:
-# =============================================================================
 
-month_product = list(itertools.product(months, products))
-
-# 1.Number of units of every product to manufacture in each month
-dv_manufacture = {i: model.NumVar(0, 1000000, "manuf_" + str(i)) for i in month_product}
-
-# 2. Number of units of every product to store in each month
-dv_inventory = {
-    i: model.NumVar(0, maximum_inventory, "invt_" + str(i)) for i in month_product
-}
+def manufacture_ub_table(inventory_cap):
+    """Return the manufacture bounds implied by the storage limit
+    inventory_cap. Units manufactured in a month are either sold or added to
+    the inventory, so they cannot exceed the sales limit plus the storage limit."""
+    return [
+        [max_sales_table[mi][pi] + inventory_cap for pi in range(len(products))]
+        for mi in range(len(months))
+    ]
 
-# 3. Number of units of every product to sell in each month
-dv_sold = {i: model.NumVar(0, max_sales[i], "sold_" + str(i)) for i in month_product}
 
-# 4. Number of machines of scheduled for maintenance in each month
-dv_repair = {
-    (mth, mach): model.IntVar(
-        0, machines_down[mach], "down_" + str(mth) + "_" + str(mach)
+def create_solver():
+    """Return an empty solver for the factory planning 2 model."""
+    model = pywraplp.Solver(
+        "factory_planning_2", pywraplp.Solver.CBC_MIXED_INTEGER_PROGRAMMING
     )
-    for mth in months
-    for mach in machines
-}
+    model.SuppressOutput()
+    return model
+
+
+def solver_parameters():
+    """Return solve parameters with presolve on and branch-and-bound stopped
+    at a 0.01% relative gap."""
+    params = pywraplp.MPSolverParameters()
+    params.SetIntegerParam(params.PRESOLVE, params.PRESOLVE_ON)
+    params.SetDoubleParam(params.RELATIVE_MIP_GAP, 1e-4)
+    return params
+
+
+def build_model(inventory_cap=maximum_inventory):
+    """Build the factory planning 2 model with the storage limit inventory_cap
+    and return the solver."""
+    # model instantiation
+    model = create_solver()
+
+    # =============================================================================
+    # # Decision variables:
+    # =============================================================================
+
+    # Variables are kept in nested lists indexed by integer positions,
+    # [month index][product index] and [month index][machine index].
+
+    # 1.Number of units of every product to manufacture in each month
+    manufacture_ub = manufacture_ub_table(inventory_cap)
+    dv_manufacture = [
+        [
+            model.NumVar(0, manufacture_ub[mi][pi], "manuf_" + mth + "_" + prd)
+            for pi, prd in enumerate(products)
+        ]
+        for mi, mth in enumerate(months)
+    ]
+
+    # 2. Number of units of every product to store in each month
+    dv_inventory = [
+        [model.NumVar(0, inventory_cap, "invt_" + mth + "_" + prd) for prd in products]
+        for mth in months
+    ]
+
+    # 3. Number of units of every product to sell in each month
+    dv_sold = [
+        [
+            model.NumVar(0, max_sales_table[mi][pi], "sold_" + mth + "_" + prd)
+            for pi, prd in enumerate(products)
+        ]
+        for mi, mth in enumerate(months)
+    ]
+
+    # 4. Number of machines of scheduled for maintenance in each month
+    #    Identical machines are already aggregated into one count per machine
+    #    type, so the schedule carries no permutation symmetry to break, and
+    #    ordering repairs across months would cut off optimal plans.
+    dv_repair = [
+        [
+            model.IntVar(0, machines_down[mach], "down_" + mth + "_" + mach)
+            for mach in machines
+        ]
+        for mth in months
+    ]
+
+    # =============================================================================
+    # # Constraints:
+    # =============================================================================
+
+    # 1. Initial Balance: For each product the number of units produced
+    #    should be equal to the number of units sold plus inventory
+    for pi in range(len(products)):
+        model.Add(dv_manufacture[0][pi] == dv_sold[0][pi] + dv_inventory[0][pi])
+
+    # 2. Balance: For each product the number of units produced in each month
+    #    and the ones previously stored should be equal to the number of units
+    #    sold and inventory stored in that month
+    for mi in range(1, len(months)):
+        for pi in range(len(products)):
+            model.Add(
+                dv_inventory[mi - 1][pi] + dv_manufacture[mi][pi]
+                == dv_sold[mi][pi] + dv_inventory[mi][pi]
+            )
 
+    # 3. Inventory Target: The number of units of product kept in inventory
+    #    at the end of the planning horizon should be equal to inventory target
+    for pi in range(len(products)):
+        model.Add(dv_inventory[-1][pi] == inventory_target)
+
+    # 4. Machine Capacity: Total time used to manufacture any product at machine
+    #    cannot exceed its monthly capacity (in hours).
+    prd_index = {prd: pi for pi, prd in enumerate(products)}
+    mach_cache = [
+        (
+            [prd_index[prd] for prd in time_required[mach]],
+            [time_required[mach][prd] for prd in time_required[mach]],
+        )
+        for mach in machines
+    ]
+    for mi in range(len(months)):
+        for ki, mach in enumerate(machines):
+            mach_prds, mach_coeffs = mach_cache[ki]
+            model.Add(
+                model.Sum(
+                    [
+                        coeff * dv_manufacture[mi][pi]
+                        for coeff, pi in zip(mach_coeffs, mach_prds)
+                    ]
+                )
+                <= hours_per_month * (machines_installed[mach] - dv_repair[mi][ki])
+            )
 
-# =============================================================================
-# # Constraints:
-# =============================================================================
+    # 5. The number of machines scheduled for maintenance should meet the
+    #    downtime requirement.
+    for ki, mach in enumerate(machines):
+        model.Add(
+            model.Sum([dv_repair_mth[ki] for dv_repair_mth in dv_repair])
+            == machines_down[mach]
+        )
 
-# 1. Initial Balance: For each product the number of units produced
-#    should be equal to the number of units sold plus inventory
-for prd in products:
-    model.Add(
-        dv_manufacture["Jan", prd] == dv_sold["Jan", prd] + dv_inventory["Jan", prd]
+    # =============================================================================
+    # # Objective function
+    # =============================================================================
+
+    sold_vars = [var for dv_sold_mth in dv_sold for var in dv_sold_mth]
+    inventory_vars = [
+        var for dv_inventory_mth in dv_inventory for var in dv_inventory_mth
+    ]
+    obj_vars = sold_vars + inventory_vars
+    obj_coeffs = [profit[prd] for mth in months for prd in products] + (
+        [-inventory_holding_cost] * len(inventory_vars)
     )
 
-# 2. Balance: For each product the number of units produced in each month
-#    and the ones previously stored should be equal to the number of units
-#    sold and inventory stored in that month
-for mth in months[1:]:
-    for prd in products:
-        mth_index = months.index(mth)
-        prev_mth = months[mth_index - 1]
-        model.Add(
-            dv_inventory[prev_mth, prd] + dv_manufacture[mth, prd]
-            == dv_sold[mth, prd] + dv_inventory[mth, prd]
-        )
+    obj_func = model.Sum([coeff * var for coeff, var in zip(obj_coeffs, obj_vars)])
 
+    model.Maximize(obj_func)
+    return model
 
-# 3. Inventory Target: The number of units of product kept in inventory
-#    at the end of the planning horizon should be equal to inventory target
-for prd in products:
-    model.Add(dv_inventory["Jun", prd] == inventory_target)
 
-# 4. Machine Capacity: Total time used to manufacture any product at machine
-#    cannot exceed its monthly capacity (in hours).
-for mth in months:
-    for mach in machines:
-        model.Add(
-            model.Sum(
-                time_required[mach][prd] * dv_manufacture[mth, prd]
-                for prd in time_required[mach]
+def resolve_with_inventory_cap(model, inventory_cap):
+    """Re-solve a built model with the storage limit inventory_cap and return
+    the solver status. The inventory bounds and the manufacture bounds derived
+    from them are changed in place instead of building a new model."""
+    manufacture_ub = manufacture_ub_table(inventory_cap)
+    for mi, mth in enumerate(months):
+        for pi, prd in enumerate(products):
+            model.LookupVariable("invt_" + mth + "_" + prd).SetUb(inventory_cap)
+            model.LookupVariable("manuf_" + mth + "_" + prd).SetUb(
+                manufacture_ub[mi][pi]
             )
-            <= hours_per_month * (machines_installed[mach] - dv_repair[mth, mach])
-        )
+    return model.Solve(solver_parameters())
 
-# 5. The number of machines scheduled for maintenance should meet the
-#    downtime requirement.
-for mach in machines:
-    model.Add(model.Sum(dv_repair[mth, mach] for mth in months) == machines_down[mach])
 
-# =============================================================================
-# # Objective function
-# =============================================================================
+def load_model():
+    """Return the factory planning 2 model, reloaded from the disk cache when the
+    model source is unchanged."""
+    return cached_model("factory_planning_2", __file__, create_solver, build_model)
+
+
+def solve_factory_planning():
+    """Solve the factory planning 2 model, return the solver status and the
+    objective value."""
+    model = load_model()
+    status = model.Solve(solver_parameters())
+    return status, model.Objective().Value()
+
+
+def main(verbose=False):
+    """Solve the factory planning 2 model and print its objective value."""
+    # solving the model
+    model = load_model()
+    status = model.Solve(solver_parameters())
+    print_solution(model, status, verbose)
+
 
-obj_func = model.Sum(
-    profit[prd] * dv_sold[mth, prd] for mth in months for prd in products
-) - model.Sum(
-    inventory_holding_cost * dv_inventory[mth, prd]
-    for mth in months
-    for prd in products
-)
-
-
-# solving the model
-model.Maximize(obj_func)
-
-status = model.Solve()
-
-# test if solution is optimal
-if status == pywraplp.Solver.OPTIMAL:
-    print("Solution:")
-    print("Objective value =", model.Objective().Value())
-else:
-    print("The problem does not have an optimal solution.")
-
-print("\n")
-print("Problem size:")
-print("Number of decision variables =", model.NumVariables())
-print("Number of constraints =", model.NumConstraints())
-
-print("\n")
-print("Advanced usage:")
-print("Problem solved in %s seconds" % str(model.wall_time() / 1000))
-print("Problem solved in %s iterations" % str(model.iterations()))
-print("Problem solved in %d branch-and-bound nodes" % model.nodes())
+if __name__ == "__main__":
+    main(verbose_flag())
@@ -8,10 +8,11 @@
    Optimization model written below uses Google OR-Tools
 """
 
-import itertools
-
 from ortools.linear_solver import pywraplp
 
+from model_cache import cached_model
+from solver_utils import lp_solver_parameters, print_solution, verbose_flag
+
 # =============================================================================
 # Data
 # =============================================================================
@@ -62,118 +63,208 @@ target_store_inventory = 500
 veg_upper_cap = 200
 oil_upper_cap = 250
 
+# veg oils
+veg_oils = ["VEG1", "VEG2"]
+non_veg_oils = ["OIL1", "OIL2", "OIL3"]
+
 min_hardness = 3
 max_hardness = 6
 inventory_holding_cost = 5
 
-# model instantiation
-model = pywraplp.Solver("food_manufacture_1", pywraplp.Solver.GLOP_LINEAR_PROGRAMMING)
-
-# =============================================================================
-# # Decision variables:
-# =============================================================================
-
-# 1. Tons of food to produce every month
-dv_prod = {i: model.NumVar(0, 1000000, "prod_month_" + i) for i in months}
-
-month_oil = list(itertools.product(months, oils))
-
-# 2. Tons of oil to buy at month t
-dv_oil_buy = {i: model.NumVar(0, 1000000, "buy_oil_" + str(i)) for i in month_oil}
-
-# 3. Tons of oil o consumed every month
-dv_oil_consume = {
-    i: model.NumVar(0, 1000000, "consume_oil_" + str(i)) for i in month_oil
-}
-
-# 4. Tons of oil put in inventory every month
-dv_oil_inventory = {
-    i: model.NumVar(0, 1000000, "invt_oil_" + str(i)) for i in month_oil
-}
-
-# =============================================================================
-# # Constraints:
-# =============================================================================
-
-# 1. Balance constraint for January
-for ol in oils:
-    model.Add(
-        init_store_inventory + dv_oil_buy["Jan", ol]
-        == dv_oil_consume["Jan", ol] + dv_oil_inventory["Jan", ol]
+# lookup table indexed by [month index][oil index]
+cost_table = [[cost[mth, ol] for ol in oils] for mth in months]
+
+
+def variable_bounds(veg_cap):
+    """Return the consumption, production, inventory and purchase bounds
+    implied by the vegetable oil refining capacity veg_cap. Stock held after
+    a month can only be refined in later months or kept for the target, and
+    oil bought in a month is either refined or stored."""
+    refining_cap = [veg_cap if ol in veg_oils else oil_upper_cap for ol in oils]
+    prod_ub = veg_cap + oil_upper_cap
+    inventory_ub_table = [
+        [
+            target_store_inventory + refining_cap[oi] * (len(months) - 1 - mi)
+            for oi in range(len(oils))
+        ]
+        for mi in range(len(months))
+    ]
+    buy_ub_table = [
+        [inventory_ub_table[mi][oi] + refining_cap[oi] for oi in range(len(oils))]
+        for mi in range(len(months))
+    ]
+    return refining_cap, prod_ub, inventory_ub_table, buy_ub_table
+
+
+def create_solver():
+    """Return an empty solver for the food manufacture 1 model."""
+    model = pywraplp.Solver(
+        "food_manufacture_1", pywraplp.Solver.GLOP_LINEAR_PROGRAMMING
     )
-
-# 2. Balance constraint for subsequent months
-for mth in months[1:]:
-    mth_index = months.index(mth)
-    prev_mth = months[mth_index - 1]
-    for ol in oils:
+    model.SuppressOutput()
+    return model
+
+
+def build_model(veg_cap=veg_upper_cap):
+    """Build the food manufacture 1 model with the vegetable oil refining
+    capacity veg_cap and return the solver."""
+    # model instantiation
+    model = create_solver()
+    refining_cap, prod_ub, inventory_ub_table, buy_ub_table = variable_bounds(veg_cap)
+
+    # =============================================================================
+    # # Decision variables:
+    # =============================================================================
+
+    # Variables are kept in lists indexed by integer positions,
+    # [month index] and [month index][oil index].
+
+    # 1. Tons of food to produce every month
+    dv_prod = [model.NumVar(0, prod_ub, "prod_month_" + mth) for mth in months]
+
+    # 2. Tons of oil to buy at month t
+    dv_oil_buy = [
+        [
+            model.NumVar(0, buy_ub_table[mi][oi], "buy_oil_" + mth + "_" + ol)
+            for oi, ol in enumerate(oils)
+        ]
+        for mi, mth in enumerate(months)
+    ]
+
+    # 3. Tons of oil o consumed every month
+    dv_oil_consume = [
+        [
+            model.NumVar(0, refining_cap[oi], "consume_oil_" + mth + "_" + ol)
+            for oi, ol in enumerate(oils)
+        ]
+        for mth in months
+    ]
+
+    # 4. Tons of oil put in inventory every month
+    dv_oil_inventory = [
+        [
+            model.NumVar(0, inventory_ub_table[mi][oi], "invt_oil_" + mth + "_" + ol)
+            for oi, ol in enumerate(oils)
+        ]
+        for mi, mth in enumerate(months)
+    ]
+
+    # =============================================================================
+    # # Constraints:
+    # =============================================================================
+
+    # 1. Balance constraint for January
+    for oi in range(len(oils)):
         model.Add(
-            dv_oil_inventory[prev_mth, ol] + dv_oil_buy[mth, ol]
-            == dv_oil_consume[mth, ol] + dv_oil_inventory[mth, ol]
+            init_store_inventory + dv_oil_buy[0][oi]
+            == dv_oil_consume[0][oi] + dv_oil_inventory[0][oi]
         )
 
-# 3. End of month inventory target
-for ol in oils:
-    model.Add(dv_oil_inventory["Jun", ol] == target_store_inventory)
-
-
-# 4. Total Tons of each oil consumed in every month cannot exceed
-#    the refinement capacity
+    # 2. Balance constraint for subsequent months
+    for mi in range(1, len(months)):
+        for oi in range(len(oils)):
+            model.Add(
+                dv_oil_inventory[mi - 1][oi] + dv_oil_buy[mi][oi]
+                == dv_oil_consume[mi][oi] + dv_oil_inventory[mi][oi]
+            )
 
-# veg oils
-veg_oils = ["VEG1", "VEG2"]
-non_veg_oils = ["OIL1", "OIL2", "OIL3"]
-for mth in months:
-    model.Add(model.Sum(dv_oil_consume[mth, ol] for ol in veg_oils) <= veg_upper_cap)
-    model.Add(
-        model.Sum(dv_oil_consume[mth, ol] for ol in non_veg_oils) <= oil_upper_cap
-    )
+    # 3. End of month inventory target
+    for oi in range(len(oils)):
+        model.Add(dv_oil_inventory[-1][oi] == target_store_inventory)
 
-# 5.The hardness value of the food produced every month should be within tolerances.
-for mth in months:
-    model.Add(
-        model.Sum(hardness[ol] * dv_oil_consume[mth, ol] for ol in oils)
-        >= min_hardness * dv_prod[mth]
-    )
-    model.Add(
-        model.Sum(hardness[ol] * dv_oil_consume[mth, ol] for ol in oils)
-        <= max_hardness * dv_prod[mth]
-    )
+    # 4. Total Tons of each oil consumed in every month cannot exceed
+    #    the refinement capacity
 
-# 6. Total Tons of oil consumed every month should be equal to the
-#    Tons of the food produced in that month.
-for mth in months:
-    model.Add(model.Sum(dv_oil_consume[mth, ol] for ol in oils) == dv_prod[mth])
+    veg_oil_index = [oils.index(ol) for ol in veg_oils]
+    non_veg_oil_index = [oils.index(ol) for ol in non_veg_oils]
+    for mi, mth in enumerate(months):
+        model.Add(
+            model.Sum([dv_oil_consume[mi][oi] for oi in veg_oil_index]) <= veg_cap,
+            "veg_capacity_" + mth,
+        )
+        model.Add(
+            model.Sum([dv_oil_consume[mi][oi] for oi in non_veg_oil_index])
+            <= oil_upper_cap
+        )
 
-# =============================================================================
-# # Objective function
-# =============================================================================
-obj_func = (
-    model.Sum(dv_prod[mth] * price for mth in months)
-    - model.Sum(cost[mth_ol] * dv_oil_buy[mth_ol] for mth_ol in month_oil)
-    - model.Sum(
-        inventory_holding_cost * dv_oil_inventory[mth_ol] for mth_ol in month_oil
+    # 5.The hardness value of the food produced every month should be within tolerances.
+    #   The hardness expression is built once per month and shared by both bounds.
+    hardness_vec = [hardness[ol] for ol in oils]
+    for mi in range(len(months)):
+        mth_hardness = model.Sum(
+            [coeff * var for coeff, var in zip(hardness_vec, dv_oil_consume[mi])]
+        )
+        model.Add(mth_hardness >= min_hardness * dv_prod[mi])
+        model.Add(mth_hardness <= max_hardness * dv_prod[mi])
+
+    # 6. Total Tons of oil consumed every month should be equal to the
+    #    Tons of the food produced in that month.
+    for mi in range(len(months)):
+        model.Add(model.Sum(dv_oil_consume[mi]) == dv_prod[mi])
+
+    # =============================================================================
+    # # Objective function
+    # =============================================================================
+    buy_vars = [var for dv_oil_buy_mth in dv_oil_buy for var in dv_oil_buy_mth]
+    inventory_vars = [
+        var for dv_oil_inventory_mth in dv_oil_inventory for var in dv_oil_inventory_mth
+    ]
+    obj_vars = dv_prod + buy_vars + inventory_vars
+    obj_coeffs = (
+        [price] * len(dv_prod)
+        + [-coeff for cost_mth in cost_table for coeff in cost_mth]
+        + [-inventory_holding_cost] * len(inventory_vars)
     )
-)
-
-# solving the model
-model.Maximize(obj_func)
-
-status = model.Solve()
-
-# test if solution is optimal
-if status == pywraplp.Solver.OPTIMAL:
-    print("Solution:")
-    print("Objective value =", model.Objective().Value())
-else:
-    print("The problem does not have an optimal solution.")
-
-print("\n")
-print("Problem size:")
-print("Number of decision variables =", model.NumVariables())
-print("Number of constraints =", model.NumConstraints())
 
-print("\n")
-print("Advanced usage:")
-print("Problem solved in %s seconds" % str(model.wall_time() / 1000))
-print("Problem solved in %s iterations" % str(model.iterations()))
+    obj_func = model.Sum([coeff * var for coeff, var in zip(obj_coeffs, obj_vars)])
+
+    model.Maximize(obj_func)
+    return model
+
+
+def resolve_with_veg_cap(model, veg_cap):
+    """Re-solve a built model with the vegetable oil refining capacity veg_cap
+    and return the solver status. Only the right-hand side of the refining
+    constraints and the bounds derived from it change, so GLOP restarts from
+    the previous optimal basis instead of building a new model."""
+    refining_cap, prod_ub, inventory_ub_table, buy_ub_table = variable_bounds(veg_cap)
+    for mi, mth in enumerate(months):
+        model.LookupConstraint("veg_capacity_" + mth).SetUb(veg_cap)
+        model.LookupVariable("prod_month_" + mth).SetUb(prod_ub)
+        for oi, ol in enumerate(oils):
+            model.LookupVariable("buy_oil_" + mth + "_" + ol).SetUb(
+                buy_ub_table[mi][oi]
+            )
+            model.LookupVariable("consume_oil_" + mth + "_" + ol).SetUb(
+                refining_cap[oi]
+            )
+            model.LookupVariable("invt_oil_" + mth + "_" + ol).SetUb(
+                inventory_ub_table[mi][oi]
+            )
+    return model.Solve(lp_solver_parameters())
+
+
+def load_model():
+    """Return the food manufacture 1 model, reloaded from the disk cache when the
+    model source is unchanged."""
+    return cached_model("food_manufacture_1", __file__, create_solver, build_model)
+
+
+def solve_food_manufacture():
+    """Solve the food manufacture 1 model, return the solver status and the
+    objective value."""
+    model = load_model()
+    status = model.Solve(lp_solver_parameters())
+    return status, model.Objective().Value()
+
+
+def main(verbose=False):
+    """Solve the food manufacture 1 model and print its objective value."""
+    # solving the model
+    model = load_model()
+    status = model.Solve(lp_solver_parameters())
+    print_solution(model, status, verbose)
+
+
+if __name__ == "__main__":
+    main(verbose_flag())
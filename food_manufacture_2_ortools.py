@@ -8,10 +8,10 @@
    Optimization model written below uses Google OR-Tools
 """
 
-import itertools
-
 from ortools.linear_solver import pywraplp
 
+from solver_utils import print_solution, verbose_flag
+
 # =============================================================================
 # Data
 # =============================================================================
@@ -73,6 +73,7 @@ minimum_consumption = 20
 model = pywraplp.Solver(
     "food_manufacture_2", pywraplp.Solver.CBC_MIXED_INTEGER_PROGRAMMING
 )
+model.SuppressOutput()
 
 # =============================================================================
 # # Decision variables:
@@ -81,7 +82,7 @@ model = pywraplp.Solver(
 # 1. Tons of food to produce every month
 dv_prod = {i: model.NumVar(0, 1000000, "prod_month_" + i) for i in months}
 
-month_oil = list(itertools.product(months, oils))
+month_oil = [(mth, ol) for mth in months for ol in oils]
 
 # 2. Tons of oil to buy at month t
 dv_oil_buy = {i: model.NumVar(0, 1000000, "buy_oil_" + str(i)) for i in month_oil}
@@ -189,22 +190,12 @@ obj_func = (
 # solving the model
 model.Maximize(obj_func)
 
-status = model.Solve()
-
-# test if solution is optimal
-if status == pywraplp.Solver.OPTIMAL:
-    print("Solution:")
-    print("Objective value =", model.Objective().Value())
-else:
-    print("The problem does not have an optimal solution.")
-
-print("\n")
-print("Problem size:")
-print("Number of decision variables =", model.NumVariables())
-print("Number of constraints =", model.NumConstraints())
-
-print("\n")
-print("Advanced usage:")
-print("Problem solved in %s seconds" % str(model.wall_time() / 1000))
-print("Problem solved in %s iterations" % str(model.iterations()))
-print("Problem solved in %d branch-and-bound nodes" % model.nodes())
+
+def main(verbose=False):
+    """Solve the food manufacture 2 model and print its objective value."""
+    status = model.Solve()
+    print_solution(model, status, verbose)
+
+
+if __name__ == "__main__":
+    main(verbose_flag())
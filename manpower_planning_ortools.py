@@ -9,10 +9,11 @@
    Optimization model written below uses Google OR-Tools
 """
 
-import itertools
-
 from ortools.linear_solver import pywraplp
 
+from model_cache import cached_model
+from solver_utils import lp_solver_parameters, print_solution, verbose_flag
+
 # =============================================================================
 # Data
 # =============================================================================
@@ -59,155 +60,281 @@ layoff_cost = {"s1": 200, "s2": 500, "s3": 500}
 parttime_cost = {"s1": 500, "s2": 400, "s3": 400}
 overmanning_cost = {"s1": 1500, "s2": 2000, "s3": 3000}
 
-# model instantiation
-model = pywraplp.Solver("manpower_planning", pywraplp.Solver.GLOP_LINEAR_PROGRAMMING)
+# lookup tables indexed by [year index][skill index]
+demand_table = [[demand[t, s] for s in skills] for t in years]
+max_hiring_table = [[max_hiring[t, s] for s in skills] for t in years]
+
+# skill positions used by the training constraints and the bounds below
+unskilled, semiskilled, skilled = (skills.index(s) for s in ["s1", "s2", "s3"])
+
+# The demand constraint caps the workforce of a skill at demand plus
+# overmanning plus part-time workers, which also caps the workforce carried
+# over into the next year.
+workforce_ub_table = [
+    [
+        demand_table[ti][si] + max_overmanning + parttime_cap * max_parttime
+        for si in range(len(skills))
+    ]
+    for ti in range(len(years))
+]
+
+# Retraining into a higher skill is capped by the training constraints.
+upgrade_ub_table = [
+    {
+        (unskilled, semiskilled): max_train_unskilled,
+        (unskilled, skilled): 0,
+        (semiskilled, skilled): max_train_semiskilled * workforce_ub_table[ti][skilled],
+    }
+    for ti in range(len(years))
+]
+
+# Workers of a skill that can be laid off or retrained in a year: the carried
+# over workforce, new hires and workers retrained into the skill. Downgraded
+# workers come from higher skills, so the table is filled from the highest
+# skill down.
+supply_ub_table = []
+for ti in range(len(years)):
+    supply_ub = [0] * len(skills)
+    for si in reversed(range(len(skills))):
+        s = skills[si]
+        if ti == 0:
+            carried_over = current_workforce[s]
+        else:
+            carried_over = workforce_ub_table[ti - 1][si]
+        supply_ub[si] = (
+            (1 - experienced_attrition[s]) * carried_over
+            + (1 - new_hire_attrition[s]) * max_hiring_table[ti][si]
+            + (1 - experienced_attrition[s])
+            * sum(upgrade_ub_table[ti][s2i, si] for s2i in range(si))
+            + (1 - downgrade_skill_attrition)
+            * sum(supply_ub[s2i] for s2i in range(si + 1, len(skills)))
+        )
+    supply_ub_table.append(supply_ub)
+
+# Upgrades keep their training limits, downgrades are limited by the supply of
+# the skill they leave and a skill is never retrained into itself.
+train_ub_table = [
+    [
+        [
+            (
+                upgrade_ub_table[ti][si, s2i]
+                if s2i > si
+                else supply_ub_table[ti][si] if s2i < si else 0
+            )
+            for s2i in range(len(skills))
+        ]
+        for si in range(len(skills))
+    ]
+    for ti in range(len(years))
+]
+
+
+def create_solver():
+    """Return an empty solver for the manpower planning model."""
+    model = pywraplp.Solver(
+        "manpower_planning", pywraplp.Solver.GLOP_LINEAR_PROGRAMMING
+    )
+    model.SuppressOutput()
+    return model
+
+
+def build_model():
+    """Build the manpower planning model and return the solver."""
+    # model instantiation
+    model = create_solver()
+
+    # =============================================================================
+    # # Decision variables:
+    # =============================================================================
+
+    # Variables are kept in nested lists indexed by integer positions,
+    # [year index][skill index] and [year index][skill index][skill index].
+
+    # 1. Number of workers of each skill to hire in each year
+    dv_hire = [
+        [
+            model.NumVar(0, max_hiring_table[ti][si], "hire_" + str(t) + "_" + s)
+            for si, s in enumerate(skills)
+        ]
+        for ti, t in enumerate(years)
+    ]
+
+    # 2. Number of part-time workers of each skill working in each year
+    dv_part_time = [
+        [model.NumVar(0, max_parttime, "part_time_" + str(t) + "_" + s) for s in skills]
+        for t in years
+    ]
+
+    # 3. Number of workers of each skill that are available in each year
+    dv_workforce = [
+        [
+            model.NumVar(0, workforce_ub_table[ti][si], "workforce_" + str(t) + "_" + s)
+            for si, s in enumerate(skills)
+        ]
+        for ti, t in enumerate(years)
+    ]
+
+    # 4. Number of workers of each skill that are laid off in each year
+    dv_layoff = [
+        [
+            model.NumVar(0, supply_ub_table[ti][si], "layoff_" + str(t) + "_" + s)
+            for si, s in enumerate(skills)
+        ]
+        for ti, t in enumerate(years)
+    ]
+
+    # 5. Number of workers of each skill that are overmanned in each year
+    dv_excess = [
+        [model.NumVar(0, max_overmanning, "excess_" + str(t) + "_" + s) for s in skills]
+        for t in years
+    ]
+
+    # 6. Number of workers of one skill to retrain to another skill in each year
+    dv_train = [
+        [
+            [
+                model.NumVar(
+                    0,
+                    train_ub_table[ti][si][s2i],
+                    "train_" + str(t) + "_" + s + "_" + s2,
+                )
+                for s2i, s2 in enumerate(skills)
+            ]
+            for si, s in enumerate(skills)
+        ]
+        for ti, t in enumerate(years)
+    ]
+
+    # =============================================================================
+    # # Constraints:
+    # =============================================================================
+
+    # Lower and upper skill positions of every skill, shared by both balance
+    # constraints below.
+    lower_skills = [list(range(si)) for si in range(len(skills))]
+    upper_skills = [list(range(si + 1, len(skills))) for si in range(len(skills))]
+
+    def workforce_balance_terms(ti, si):
+        """Return variables and coefficients of the workforce balance of skill
+        si in year ti with every term moved to the left-hand side, except the
+        workforce carried over from the previous year."""
+        s = skills[si]
+        balance_vars = [dv_workforce[ti][si], dv_hire[ti][si], dv_layoff[ti][si]]
+        balance_coeffs = [1, -(1 - new_hire_attrition[s]), 1]
+        for s2i in lower_skills[si]:
+            balance_vars += [dv_train[ti][s2i][si], dv_train[ti][si][s2i]]
+            balance_coeffs += [-(1 - experienced_attrition[s]), 1]
+        for s2i in upper_skills[si]:
+            balance_vars += [dv_train[ti][s2i][si], dv_train[ti][si][s2i]]
+            balance_coeffs += [-(1 - downgrade_skill_attrition), 1]
+        return balance_vars, balance_coeffs
+
+    # 1. Initial workforce balance, year == 1:
+    for si, s in enumerate(skills):
+        balance_vars, balance_coeffs = workforce_balance_terms(0, si)
+        model.Add(
+            model.Sum([coeff * var for coeff, var in zip(balance_coeffs, balance_vars)])
+            == (1 - experienced_attrition[s]) * current_workforce[s]
+        )
 
-# =============================================================================
-# # Decision variables:
-# =============================================================================
+    # 2. Subsequent workforce balance, year > 1:
+    for ti in range(1, len(years)):
+        for si, s in enumerate(skills):
+            balance_vars, balance_coeffs = workforce_balance_terms(ti, si)
+            balance_vars.append(dv_workforce[ti - 1][si])
+            balance_coeffs.append(-(1 - experienced_attrition[s]))
+            model.Add(
+                model.Sum(
+                    [coeff * var for coeff, var in zip(balance_coeffs, balance_vars)]
+                )
+                == 0
+            )
 
-year_skill = list(itertools.product(years, skills))
+    # 3. Unskilled training - Unskilled workers trained in an year cannot exceed
+    #    the maximum allowance. Unskilled workers cannot be immediately transformed
+    #    into skilled workers.
+    for ti in range(len(years)):
+        model.Add(dv_train[ti][unskilled][semiskilled] <= max_train_unskilled)
+        model.Add(dv_train[ti][unskilled][skilled] == 0)
 
-# 1. Number of workers of each skill to hire in each year
-dv_hire = {i: model.NumVar(0, max_hiring[i], "hire_" + str(i)) for i in year_skill}
+    # 4. Semi-skilled Training: Semi-skilled workers trained in an year cannot
+    #    exceed the maximum allowance.
+    for ti in range(len(years)):
+        model.Add(
+            dv_train[ti][semiskilled][skilled]
+            <= max_train_semiskilled * dv_workforce[ti][skilled]
+        )
 
-# 2. Number of part-time workers of each skill working in each year
-dv_part_time = {
-    i: model.NumVar(0, max_parttime, "part_time_" + str(i)) for i in year_skill
-}
+    # 5. Overmanning: Excess workers in year t cannot exceed the maximum allowance.
+    for dv_excess_year in dv_excess:
+        model.Add(model.Sum(dv_excess_year) <= max_overmanning)
+
+    # 6. Demand: Workforce s available in year t equals the required number of
+    #    workers plus the excess workers and the part-time workers.
+    for ti in range(len(years)):
+        for si in range(len(skills)):
+            model.Add(
+                dv_workforce[ti][si]
+                == demand_table[ti][si]
+                + dv_excess[ti][si]
+                + (parttime_cap * dv_part_time[ti][si])
+            )
 
-# 3. Number of workers of each skill that are available in each year
-dv_workforce = {i: model.NumVar(0, 1000000, "workforce_" + str(i)) for i in year_skill}
+    # =============================================================================
+    # Objective function
+    # =============================================================================
 
-# 4. Number of workers of each skill that are laid off in each year
-dv_layoff = {i: model.NumVar(0, 1000000, "layoff_" + str(i)) for i in year_skill}
+    # Objective function 1 :
+    # Layoffs: Minimize the total layoffs during the planning horizon.
+    obj_layoffs = model.Sum(
+        [var for dv_layoff_year in dv_layoff for var in dv_layoff_year]
+    )
 
-# 5. Number of workers of each skill that are overmanned in each year
-dv_excess = {i: model.NumVar(0, 1000000, "excess_" + str(i)) for i in year_skill}
+    # Objective function 2 :
+    # Cost: Minimize the total cost (in USD) incurred by training, overmanning,
+    # part-time workers, and layoffs in the planning horizon.
 
-year_skill_skill = list(itertools.product(years, skills, skills))
+    # obj_cost = model.Sum(
+    #     training_cost[s] * dv_train[ti][si][si + 1]
+    #     for ti in range(len(years))
+    #     for si, s in enumerate(skills[:-1])
+    # ) + model.Sum(
+    #     layoff_cost[s] * dv_layoff[ti][si]
+    #     + parttime_cost[s] * dv_part_time[ti][si]
+    #     + overmanning_cost[s] * dv_excess[ti][si]
+    #     for ti in range(len(years))
+    #     for si, s in enumerate(skills)
+    # )
 
-# 6. Number of workers of one skill to retrain to another skill in each year
-dv_train = {i: model.NumVar(0, 1000000, "train_" + str(i)) for i in year_skill_skill}
+    # minimize layoffs
+    model.Minimize(obj_layoffs)
 
-# =============================================================================
-# # Constraints:
-# =============================================================================
+    # minimize cost
+    # model.Minimize(obj_cost)
+    return model
 
-# 1. Initial workforce balance, year == 1:
-for s in skills:
-    model.Add(
-        dv_workforce[1, s]
-        == ((1 - experienced_attrition[s]) * current_workforce[s])
-        + ((1 - new_hire_attrition[s]) * dv_hire[1, s])
-        + model.Sum(
-            ((1 - experienced_attrition[s]) * dv_train[1, s2, s]) - dv_train[1, s, s2]
-            for s2 in skills
-            if s2 < s
-        )
-        + model.Sum(
-            ((1 - downgrade_skill_attrition) * dv_train[1, s2, s]) - dv_train[1, s, s2]
-            for s2 in skills
-            if s2 > s
-        )
-        - dv_layoff[1, s]
-    )
 
-# 2. Subsequent workforce balance, year > 1:
-for t in years[1:]:
-    for s in skills:
-        model.Add(
-            dv_workforce[t, s]
-            == ((1 - experienced_attrition[s]) * dv_workforce[t - 1, s])
-            + ((1 - new_hire_attrition[s]) * dv_hire[t, s])
-            + model.Sum(
-                ((1 - experienced_attrition[s]) * dv_train[t, s2, s])
-                - dv_train[t, s, s2]
-                for s2 in skills
-                if s2 < s
-            )
-            + model.Sum(
-                ((1 - downgrade_skill_attrition) * dv_train[t, s2, s])
-                - dv_train[t, s, s2]
-                for s2 in skills
-                if s2 > s
-            )
-            - dv_layoff[t, s]
-        )
+def load_model():
+    """Return the manpower planning model, reloaded from the disk cache when the
+    model source is unchanged."""
+    return cached_model("manpower_planning", __file__, create_solver, build_model)
 
-# 3. Unskilled training - Unskilled workers trained in an year cannot exceed
-#    the maximum allowance. Unskilled workers cannot be immediately transformed
-#    into skilled workers.
-for t in years:
-    model.Add(dv_train[t, "s1", "s2"] <= max_train_unskilled)
-    model.Add(dv_train[t, "s1", "s3"] == 0)
-
-# 4. Semi-skilled Training: Semi-skilled workers trained in an year cannot
-#    exceed the maximum allowance.
-for t in years:
-    model.Add(dv_train[t, "s2", "s3"] <= max_train_semiskilled * dv_workforce[t, "s3"])
-
-# 5. Overmanning: Excess workers in year t cannot exceed the maximum allowance.
-for t in years:
-    model.Add(model.Sum(dv_excess[t, s] for s in skills) <= max_overmanning)
-
-# 6. Demand: Workforce s available in year t equals the required number of
-#    workers plus the excess workers and the part-time workers.
-for t in years:
-    for s in skills:
-        model.Add(
-            dv_workforce[t, s]
-            == demand[t, s] + dv_excess[t, s] + (parttime_cap * dv_part_time[t, s])
-        )
 
-# =============================================================================
-# Objective function
-# =============================================================================
+def solve_manpower():
+    """Solve the manpower planning model, return the solver status and the
+    objective value."""
+    model = load_model()
+    status = model.Solve(lp_solver_parameters())
+    return status, model.Objective().Value()
+
+
+def main(verbose=False):
+    """Solve the manpower planning model and print its objective value."""
+    # solving the model
+    model = load_model()
+    status = model.Solve(lp_solver_parameters())
+    print_solution(model, status, verbose)
+
 
-# Objective function 1 :
-# Layoffs: Minimize the total layoffs during the planning horizon.
-obj_layoffs = model.Sum(dv_layoff[t, s] for t in years for s in skills)
-
-# Objective function 2 :
-# Cost: Minimize the total cost (in USD) incurred by training, overmanning,
-# part-time workers, and layoffs in the planning horizon.
-
-# obj_cost = model.Sum(
-#     (training_cost[s] * dv_train[t, s, skills[skills.index(s) + 1]]) if s < "s3" else 0
-#     for t in years
-#     for s in skills
-# ) + model.Sum(
-#     layoff_cost[s] * dv_layoff[t, s]
-#     + parttime_cost[s] * dv_part_time[t, s]
-#     + overmanning_cost[s] * dv_excess[t, s]
-#     for t in years
-#     for s in skills
-# )
-
-
-# solving the model
-
-# minimize layoffs
-model.Minimize(obj_layoffs)
-
-# minimize cost
-# model.Minimize(obj_cost)
-
-status = model.Solve()
-
-# test if solution is optimal
-if status == pywraplp.Solver.OPTIMAL:
-    print("Solution:")
-    print("Objective value =", model.Objective().Value())
-else:
-    print("The problem does not have an optimal solution.")
-
-print("\n")
-print("Problem size:")
-print("Number of decision variables =", model.NumVariables())
-print("Number of constraints =", model.NumConstraints())
-
-print("\n")
-print("Advanced usage:")
-print("Problem solved in %s seconds" % str(model.wall_time() / 1000))
-print("Problem solved in %s iterations" % str(model.iterations()))
+if __name__ == "__main__":
+    main(verbose_flag())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+   Disk cache for built OR-Tools models. A model is exported once as a
+   serialized MPModelProto and reloaded on later runs, skipping the Python
+   model build as long as the model source, this module and the OR-Tools
+   version are unchanged.
+"""
+
+import glob
+import hashlib
+import os
+
+import ortools
+from google.protobuf.message import DecodeError
+from ortools.linear_solver import linear_solver_pb2
+
+# kept next to this module, so the cache does not depend on the working directory
+cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".model_cache")
+
+
+def has_unique_names(model_proto):
+    """Return True when every variable and every constraint of model_proto
+    has a name of its own."""
+    for items in [model_proto.variable, model_proto.constraint]:
+        names = [item.name for item in items]
+        if "" in names or len(set(names)) != len(names):
+            return False
+    return True
+
+
+def cached_model(name, source_path, create_solver, build_model):
+    """Return a solver holding the model called name.
+
+    The cache key is a digest of the model source file, of this module and of
+    the OR-Tools version, so editing the model or its data, or upgrading
+    OR-Tools, rebuilds the model. create_solver returns an empty solver to
+    load a cached model into, build_model returns a built solver. A cache file
+    that cannot be read or loaded is rebuilt, and cache files of earlier
+    versions of the model are deleted when a new one is written.
+    """
+    digest = hashlib.sha256()
+    for path in [source_path, __file__]:
+        with open(path, "rb") as source_file:
+            digest.update(source_file.read())
+    digest.update(ortools.__version__.encode())
+    path = os.path.join(cache_dir, name + "_" + digest.hexdigest()[:16] + ".pb")
+    stale_pattern = os.path.join(cache_dir, name + "_" + "[0-9a-f]" * 16 + ".pb")
+
+    model_proto = linear_solver_pb2.MPModelProto()
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as cache_file:
+                model_proto.ParseFromString(cache_file.read())
+        except DecodeError:
+            model_proto.Clear()
+        if model_proto.variable and has_unique_names(model_proto):
+            model = create_solver()
+            # plain LoadModelFromProto replaces the names used by the lookups
+            # of the re-solve helpers, this variant keeps them and only aborts
+            # on duplicate names, which were ruled out above
+            if not model.LoadModelFromProtoWithUniqueNamesOrDie(model_proto):
+                return model
+
+    model = build_model()
+    model_proto.Clear()
+    model.ExportModelToProto(model_proto)
+    os.makedirs(cache_dir, exist_ok=True)
+    # write next to the target and rename, so parallel runs never read a
+    # partially written file
+    tmp_path = path + "." + str(os.getpid())
+    with open(tmp_path, "wb") as cache_file:
+        cache_file.write(model_proto.SerializeToString())
+    os.replace(tmp_path, path)
+    for stale_path in glob.glob(stale_pattern):
+        if stale_path != path:
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                # already removed by a run in another process
+                pass
+    return model
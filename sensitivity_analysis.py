@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+   Re-solves factory planning 2 for other storage limits and food manufacture 1
+   for other vegetable oil refining capacities. Every re-solve changes the
+   bounds of the already solved model in place and its objective value is
+   checked against a model built from scratch for the same limit.
+"""
+
+import math
+import sys
+
+from ortools.linear_solver import pywraplp
+
+from factory_planning_2_ortools import build_model as build_factory_planning
+from factory_planning_2_ortools import resolve_with_inventory_cap, solver_parameters
+from food_manufacture_1_ortools import build_model as build_food_manufacture
+from food_manufacture_1_ortools import resolve_with_veg_cap
+from solver_utils import lp_solver_parameters
+
+analyses = [
+    (
+        "Maximum inventory",
+        build_factory_planning,
+        solver_parameters,
+        resolve_with_inventory_cap,
+        [75, 125],
+    ),
+    (
+        "Vegetable oil capacity",
+        build_food_manufacture,
+        lp_solver_parameters,
+        resolve_with_veg_cap,
+        [180, 220],
+    ),
+]
+
+
+if __name__ == "__main__":
+    mismatches = 0
+    for label, build_model, parameters, resolve, caps in analyses:
+        model = build_model()
+        model.Solve(parameters())
+        for cap in caps:
+            status = resolve(model, cap)
+            fresh_model = build_model(cap)
+            fresh_status = fresh_model.Solve(parameters())
+            if status != pywraplp.Solver.OPTIMAL:
+                print("%s = %d, no optimal solution" % (label, cap))
+                mismatches += 1
+                continue
+            objective_value = model.Objective().Value()
+            print("%s = %d, objective value = %s" % (label, cap, objective_value))
+            if fresh_status != pywraplp.Solver.OPTIMAL or not math.isclose(
+                objective_value, fresh_model.Objective().Value(), rel_tol=1e-6
+            ):
+                print("  differs from a fresh build:", fresh_model.Objective().Value())
+                mismatches += 1
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+   Solves factory planning 2, food manufacture 1 and manpower planning models
+   side by side. The three problems are independent, so each one is built and
+   solved in its own process.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from ortools.linear_solver import pywraplp
+
+from factory_planning_2_ortools import solve_factory_planning
+from food_manufacture_1_ortools import solve_food_manufacture
+from manpower_planning_ortools import solve_manpower
+
+models = {
+    "factory_planning_2": solve_factory_planning,
+    "food_manufacture_1": solve_food_manufacture,
+    "manpower_planning": solve_manpower,
+}
+
+
+if __name__ == "__main__":
+    with ProcessPoolExecutor(max_workers=len(models)) as executor:
+        futures = {name: executor.submit(solve) for name, solve in models.items()}
+
+    for name, future in futures.items():
+        status, objective_value = future.result()
+        if status == pywraplp.Solver.OPTIMAL:
+            print(name, "objective value =", objective_value)
+        else:
+            print(name, "does not have an optimal solution.")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+   Solver settings and command line reporting shared by the OR-Tools models.
+"""
+
+import argparse
+
+from ortools.linear_solver import pywraplp
+
+
+def lp_solver_parameters():
+    """Return solve parameters with presolve on and the dual simplex selected.
+
+    Re-solves after a bound or right-hand side change start from a basis that
+    is still dual feasible, which the dual simplex can continue from.
+    """
+    params = pywraplp.MPSolverParameters()
+    params.SetIntegerParam(params.PRESOLVE, params.PRESOLVE_ON)
+    params.SetIntegerParam(params.LP_ALGORITHM, params.DUAL)
+    return params
+
+
+def verbose_flag():
+    """Return True when the script was run with --verbose."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="print problem size and solver statistics",
+    )
+    return parser.parse_args().verbose
+
+
+def print_solution(model, status, verbose=False):
+    """Print the objective value of a solved pywraplp model, followed by the
+    problem size and solver statistics when verbose."""
+    # test if solution is optimal
+    if status == pywraplp.Solver.OPTIMAL:
+        print("Solution:")
+        print("Objective value =", model.Objective().Value())
+    else:
+        print("The problem does not have an optimal solution.")
+
+    if verbose:
+        print("\n")
+        print("Problem size:")
+        print("Number of decision variables =", model.NumVariables())
+        print("Number of constraints =", model.NumConstraints())
+
+        print("\n")
+        print("Advanced usage:")
+        print("Problem solved in %s seconds" % str(model.wall_time() / 1000))
+        print("Problem solved in %s iterations" % str(model.iterations()))
+        if model.IsMip():
+            print("Problem solved in %d branch-and-bound nodes" % model.nodes())